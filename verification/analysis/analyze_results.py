@@ -1,8 +1,13 @@
+import matplotlib
+matplotlib.use('Agg')  # file output only; skip GUI backend probing
 import pandas as pd
 import numpy as np
 import os
 import matplotlib.pyplot as plt
 
+plt.rcParams['path.simplify'] = True
+plt.rcParams['agg.path.chunksize'] = 10000
+
 # Define paths relative to this script
 BASE_TEST_DIR = "../test"
 SEQ_DIR = os.path.join(BASE_TEST_DIR, "test_s3_consistency")
@@ -27,80 +32,112 @@ def log(message, file_handle=None):
     if file_handle:
         file_handle.write(message + "\n")
 
+def sorted_values(df, mask_col, value_col):
+    # Sort the successful rows of a column once; all order stats index into it
+    return np.sort(df.loc[df[mask_col] == True, value_col].to_numpy(dtype=np.float64))
+
+def quantile_sorted(arr, q):
+    # Linear interpolation on an already-sorted array (same as pandas' default)
+    pos = (len(arr) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(arr) - 1)
+    return arr[lo] + (arr[hi] - arr[lo]) * (pos - lo)
+
 def analyze_data_plane(df_seq, df_conc, f):
     log("\n" + "="*60, f)
     log("DATA PLANE ANALYSIS (Object Consistency)", f)
     log("="*60, f)
+    seq_lat, conc_lat = None, None
 
     # Sequential Analysis
     if df_seq is not None:
         log(f"\n[Sequential Test] (N={len(df_seq)})", f)
-        success_seq = df_seq[df_seq['success'] == True]
-        log(f"  Success Rate: {len(success_seq)/len(df_seq)*100:.2f}%", f)
-        if not success_seq.empty:
-            lat = success_seq['latency_ms']
-            log(f"  Latency (ms): Mean={lat.mean():.2f}, Median={lat.median():.2f}, P99={lat.quantile(0.99):.2f}", f)
+        seq_lat = sorted_values(df_seq, 'success', 'latency_ms')
+        log(f"  Success Rate: {len(seq_lat)/len(df_seq)*100:.2f}%", f)
+        if seq_lat.size:
+            lat = seq_lat
+            log(f"  Latency (ms): Mean={lat.mean():.2f}, Median={quantile_sorted(lat, 0.5):.2f}, P99={quantile_sorted(lat, 0.99):.2f}", f)
 
     # Concurrent Analysis
     if df_conc is not None:
         log(f"\n[Concurrent Test] (N={len(df_conc)})", f)
-        success_conc = df_conc[df_conc['success'] == True]
-        log(f"  Success Rate: {len(success_conc)/len(df_conc)*100:.2f}%", f)
-        if not success_conc.empty:
+        conc_lat = sorted_values(df_conc, 'success', 'total_latency_ms')
+        log(f"  Success Rate: {len(conc_lat)/len(df_conc)*100:.2f}%", f)
+        if conc_lat.size:
+            write = sorted_values(df_conc, 'success', 'write_latency_ms')
+            read = sorted_values(df_conc, 'success', 'read_latency_ms')
             # Concurrent has breakdown
             log("  Latency Breakdown (ms):", f)
-            log(f"    Write: Mean={success_conc['write_latency_ms'].mean():.2f}, P99={success_conc['write_latency_ms'].quantile(0.99):.2f}", f)
-            log(f"    Read:  Mean={success_conc['read_latency_ms'].mean():.2f}, P99={success_conc['read_latency_ms'].quantile(0.99):.2f}", f)
-            log(f"    Total: Mean={success_conc['total_latency_ms'].mean():.2f}, P99={success_conc['total_latency_ms'].quantile(0.99):.2f}", f)
+            log(f"    Write: Mean={write.mean():.2f}, P99={quantile_sorted(write, 0.99):.2f}", f)
+            log(f"    Read:  Mean={read.mean():.2f}, P99={quantile_sorted(read, 0.99):.2f}", f)
+            log(f"    Total: Mean={conc_lat.mean():.2f}, P99={quantile_sorted(conc_lat, 0.99):.2f}", f)
+
+    return seq_lat, conc_lat
 
 def analyze_control_plane(df_seq, df_conc, f):
     log("\n" + "="*60, f)
     log("CONTROL PLANE ANALYSIS (Eventual Consistency)", f)
     log("="*60, f)
+    seq_prop, conc_prop = None, None
 
     # Sequential Analysis
     if df_seq is not None:
         log(f"\n[Sequential Test] (N={len(df_seq)})", f)
         # In sequential test, 'propagation_sec' is the metric
         # matched indicates if it eventually succeeded
-        success_seq = df_seq[df_seq['matched'] == True]
-        log(f"  Success Rate: {len(success_seq)/len(df_seq)*100:.2f}%", f)
-        if not success_seq.empty:
-            prop = success_seq['propagation_sec']
-            log(f"  Propagation (s): Mean={prop.mean():.2f}, Median={prop.median():.2f}, Max={prop.max():.2f}", f)
+        seq_prop = sorted_values(df_seq, 'matched', 'propagation_sec')
+        log(f"  Success Rate: {len(seq_prop)/len(df_seq)*100:.2f}%", f)
+        if seq_prop.size:
+            prop = seq_prop
+            log(f"  Propagation (s): Mean={prop.mean():.2f}, Median={quantile_sorted(prop, 0.5):.2f}, Max={prop[-1]:.2f}", f)
             log(f"  Instant Visibility (<1s): {(prop < 1.0).mean()*100:.1f}%", f)
 
     # Concurrent Analysis
     if df_conc is not None:
         log(f"\n[Concurrent 'Racer' Test] (N={len(df_conc)})", f)
         # In concurrent test, 'found' is success, 'delay_sec' is propagation
-        success_conc = df_conc[df_conc['found'] == True]
-        log(f"  Success Rate: {len(success_conc)/len(df_conc)*100:.2f}%", f)
-        if not success_conc.empty:
-            prop = success_conc['delay_sec']
-            log(f"  Propagation (s): Mean={prop.mean():.2f}, Median={prop.median():.2f}, Max={prop.max():.2f}", f)
+        conc_prop = sorted_values(df_conc, 'found', 'delay_sec')
+        log(f"  Success Rate: {len(conc_prop)/len(df_conc)*100:.2f}%", f)
+        if conc_prop.size:
+            prop = conc_prop
+            log(f"  Propagation (s): Mean={prop.mean():.2f}, Median={quantile_sorted(prop, 0.5):.2f}, Max={prop[-1]:.2f}", f)
             log(f"  Instant Visibility (<1s): {(prop < 1.0).mean()*100:.1f}%", f)
             
             # Tail latency analysis
             slow = prop[prop > 5.0]
-            if not slow.empty:
+            if slow.size:
                 log(f"  Tail Latency Events (>5s): {len(slow)} events", f)
-                log(f"  Worst Case: {prop.max():.2f}s", f)
+                log(f"  Worst Case: {prop[-1]:.2f}s", f)
             else:
                 log("  No tail latency events > 5s detected.", f)
 
             # API Calls Analysis
-            if 'api_calls' in success_conc.columns:
-                calls = success_conc['api_calls']
+            if 'api_calls' in df_conc.columns:
+                calls = df_conc.loc[df_conc['found'] == True, 'api_calls']
                 log(f"  API Calls: Mean={calls.mean():.2f}, Max={calls.max()}, Total={calls.sum()}", f)
 
-def plot_results(df_dp_seq, df_dp_conc, df_cp_seq, df_cp_conc):
+    return seq_prop, conc_prop
+
+def plot_density(arr, label):
+    # Same bins/normalization as plt.hist(density=True), computed in one numpy pass
+    counts, edges = np.histogram(arr, bins=30, density=True)
+    plt.stairs(counts, edges, alpha=0.5, fill=True, label=label)
+
+def plot_results(df_cp_conc, dp_seq_lat, dp_conc_lat, cp_seq_prop, cp_conc_prop):
+    # Array arguments are the sorted success-only samples from the analysis pass
+    # The scatter needs paired columns, so mask the racer frame once up front
+    cp_conc_delay, cp_conc_calls = None, None
+    if df_cp_conc is not None and 'api_calls' in df_cp_conc.columns:
+        found = df_cp_conc['found'].to_numpy(dtype=bool)
+        cp_conc_delay = df_cp_conc['delay_sec'].to_numpy()[found]
+        cp_conc_calls = df_cp_conc['api_calls'].to_numpy()[found]
+
     # 1. Data Plane Latency Comparison
     plt.figure(figsize=(10, 6))
-    if df_dp_seq is not None:
-        plt.hist(df_dp_seq[df_dp_seq['success']]['latency_ms'], bins=30, alpha=0.5, label='Sequential', density=True)
-    if df_dp_conc is not None:
-        plt.hist(df_dp_conc[df_dp_conc['success']]['total_latency_ms'], bins=30, alpha=0.5, label='Concurrent', density=True)
+    if dp_seq_lat is not None:
+        plot_density(dp_seq_lat, 'Sequential')
+    if dp_conc_lat is not None:
+        plot_density(dp_conc_lat, 'Concurrent')
     
     plt.title('Data Plane Latency Distribution (Sequential vs Concurrent)')
     plt.xlabel('Latency (ms)')
@@ -112,14 +149,12 @@ def plot_results(df_dp_seq, df_dp_conc, df_cp_seq, df_cp_conc):
 
     # 2. Control Plane Propagation Delay Comparison
     plt.figure(figsize=(10, 6))
-    if df_cp_seq is not None:
-        # Filter out timeouts if any, though matched=True handles it
-        data = df_cp_seq[df_cp_seq['matched']]['propagation_sec']
-        plt.hist(data, bins=30, alpha=0.5, label='Sequential', density=True)
+    if cp_seq_prop is not None:
+        # Timeouts are already excluded (matched=True only)
+        plot_density(cp_seq_prop, 'Sequential')
     
-    if df_cp_conc is not None:
-        data = df_cp_conc[df_cp_conc['found']]['delay_sec']
-        plt.hist(data, bins=30, alpha=0.5, label='Concurrent (Racer)', density=True)
+    if cp_conc_prop is not None:
+        plot_density(cp_conc_prop, 'Concurrent (Racer)')
 
     plt.title('Control Plane Propagation Delay (Sequential vs Concurrent)')
     plt.xlabel('Propagation Time (s)')
@@ -132,8 +167,9 @@ def plot_results(df_dp_seq, df_dp_conc, df_cp_seq, df_cp_conc):
     # 3. Control Plane Tail Latency (Concurrent Only) - CDF
     if df_cp_conc is not None:
         plt.figure(figsize=(10, 6))
-        data = np.sort(df_cp_conc[df_cp_conc['found']]['delay_sec'])
-        y = np.arange(1, len(data)+1) / len(data)
+        data = cp_conc_prop  # already sorted
+        n = len(data)
+        y = np.linspace(1/n, 1, n) if n else data
         plt.plot(data, y, marker='.', linestyle='none')
         plt.title('CDF of Control Plane Propagation (Concurrent Racer)')
         plt.xlabel('Propagation Time (s)')
@@ -145,10 +181,9 @@ def plot_results(df_dp_seq, df_dp_conc, df_cp_seq, df_cp_conc):
         plt.close()
 
         # 4. Control Plane API Calls vs Propagation (Concurrent Only)
-        if 'api_calls' in df_cp_conc.columns:
+        if cp_conc_calls is not None:
             plt.figure(figsize=(10, 6))
-            found_data = df_cp_conc[df_cp_conc['found']]
-            plt.scatter(found_data['delay_sec'], found_data['api_calls'], alpha=0.6)
+            plt.scatter(cp_conc_delay, cp_conc_calls, alpha=0.6)
             plt.title('Propagation Time vs API Calls (Concurrent Racer)')
             plt.xlabel('Propagation Time (s)')
             plt.ylabel('API Calls')
@@ -164,13 +199,13 @@ def main():
     df_cp_conc = load_csv(CONTROL_PLANE_CONC)
 
     with open(OUTPUT_REPORT, "w") as f:
-        analyze_data_plane(df_dp_seq, df_dp_conc, f)
-        analyze_control_plane(df_cp_seq, df_cp_conc, f)
+        dp_seq_lat, dp_conc_lat = analyze_data_plane(df_dp_seq, df_dp_conc, f)
+        cp_seq_prop, cp_conc_prop = analyze_control_plane(df_cp_seq, df_cp_conc, f)
     
     print(f"Analysis saved to {OUTPUT_REPORT}")
 
     print("Generating plots...")
-    plot_results(df_dp_seq, df_dp_conc, df_cp_seq, df_cp_conc)
+    plot_results(df_cp_conc, dp_seq_lat, dp_conc_lat, cp_seq_prop, cp_conc_prop)
     print("Plots saved: data_plane_latency.png, control_plane_propagation.png, control_plane_cdf.png, control_plane_api_calls.png")
 
 if __name__ == "__main__":
@@ -0,0 +1,40 @@
+import os, threading
+from functools import lru_cache
+import boto3
+from botocore.config import Config
+
+# ---------- Shared S3 client setup for the consistency scripts ----------
+AWS_REGION = os.environ.get("AWS_REGION", "us-west-2")
+SESSION = boto3.Session(region_name=AWS_REGION, profile_name=os.environ.get("AWS_PROFILE"))
+
+# The default pool (10 connections) is smaller than the 20-worker data-plane
+# pools, so every client here gets a larger keep-alive pool
+DEFAULT_POOL_SIZE = 64
+
+_tls = threading.local()
+# Session.client() is not thread-safe; serialize client construction
+_client_lock = threading.Lock()
+
+def _keep_alive(request, **kwargs):
+    request.headers["Connection"] = "keep-alive"
+
+def _new_client(pool_size):
+    with _client_lock:
+        client = SESSION.client("s3", config=Config(
+            max_pool_connections=pool_size,
+            tcp_keepalive=True,
+            retries={"max_attempts": 10, "mode": "standard"},
+        ))
+    client.meta.events.register("request-created.s3", _keep_alive)
+    return client
+
+@lru_cache(maxsize=None)
+def get_s3(pool_size=DEFAULT_POOL_SIZE):
+    # Process-wide client for setup/teardown and single-threaded call sites
+    return _new_client(pool_size)
+
+def thread_client(pool_size=DEFAULT_POOL_SIZE):
+    # One client per worker thread so workers never share a connection pool
+    if not hasattr(_tls, "c"):
+        _tls.c = _new_client(pool_size)
+    return _tls.c
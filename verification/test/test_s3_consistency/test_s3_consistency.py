@@ -1,24 +1,34 @@
-import os, time, json, uuid, datetime
-import boto3
-from botocore.config import Config
+import os, sys, csv, time, uuid, datetime
 from botocore.exceptions import ClientError
 import numpy as np
-import pandas as pd
 import uuid, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Shared client factory lives one level up in verification/test
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from s3_utils import AWS_REGION, get_s3, thread_client as _client
 
 # ---------- Config ----------
-AWS_REGION = os.environ.get("AWS_REGION", "us-west-2")
-SESSION = boto3.Session(region_name=AWS_REGION, profile_name=os.environ.get("AWS_PROFILE"))
-S3 = SESSION.client("s3", config=Config(retries={"max_attempts": 10, "mode": "standard"}))
+# S3 is shared; worker threads use their own _client() (see s3_utils)
+S3 = get_s3()
 
 TEST_BUCKET = f"cs6620-s3-consistency-{datetime.datetime.utcnow().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
 DATA_PLANE_OBJECTS = 100
 CONTROL_PLANE_ITERS = 100
+# Payload content is irrelevant to the consistency check; keys stay unique
+_BODY = b"x" * 1024
+# Read-after-write only needs visibility; HEAD skips the body transfer.
+# Set True to require a full GET + body read instead.
+VERIFY_BODY = False
+# Test 1.1 is the sequential baseline the analysis compares Test 2.1 against;
+# raise this only for a quick run, not for the Sequential vs Concurrent report
+DATA_PLANE_WORKERS = 1
 
 # Polling profile for control-plane verification
 EARLY_DENSE_SECONDS = 30        # 1s polling for first 30s
 LATE_INTERVAL_SECONDS = 3       # after that, poll every 3s
 TIMEOUT_SECONDS = 600           # hard cap for measurement
+MIN_GAP_SECONDS = 2.0           # minimum spacing between iterations
 
 # Two alternating lifecycle configs (A/B)
 def lifecycle_config(days:int, rule_id:str):
@@ -45,17 +55,17 @@ def create_bucket(bucket, region):
 
 def delete_bucket_and_contents(bucket):
     try:
-        # Delete objects
-        resp = S3.list_objects_v2(Bucket=bucket)
-        while True:
-            if "Contents" in resp:
-                to_delete = [{"Key": obj["Key"]} for obj in resp["Contents"]]
-                if to_delete:
-                    S3.delete_objects(Bucket=bucket, Delete={"Objects": to_delete})
-            if resp.get("IsTruncated"):
-                resp = S3.list_objects_v2(Bucket=bucket, ContinuationToken=resp["NextContinuationToken"])
-            else:
-                break
+        # Delete objects: collect all keys, then fire 1000-key batches in parallel
+        keys = [
+            {"Key": obj["Key"]}
+            for page in S3.get_paginator("list_objects_v2").paginate(Bucket=bucket)
+            for obj in page.get("Contents", [])
+        ]
+        chunks = [keys[i:i + 1000] for i in range(0, len(keys), 1000)]
+        if chunks:
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                # Quiet=True: response only lists failures
+                list(ex.map(lambda ch: S3.delete_objects(Bucket=bucket, Delete={"Objects": ch, "Quiet": True}), chunks))
         # Remove lifecycle (just in case)
         try:
             S3.delete_bucket_lifecycle(Bucket=bucket)
@@ -67,44 +77,68 @@ def delete_bucket_and_contents(bucket):
         print("Cleanup warning:", e)
 
 def equal_lifecycle(a, b):
-    # Normalize dicts for comparison (sort keys)
-    return json.dumps(a, sort_keys=True) == json.dumps(b, sort_keys=True)
+    # dict equality is already key-order independent
+    return a == b
 
 # ---------- Test 1.1: Data Plane ----------
 def test_data_plane(bucket):
-    rows = []
-    for i in range(DATA_PLANE_OBJECTS):
-        key = f"obj-{i:03d}-{uuid.uuid4().hex[:8]}.txt"
-        body = f"hello-{i}-{uuid.uuid4()}".encode()
-
-        t0 = time.perf_counter()
-        S3.put_object(Bucket=bucket, Key=key, Body=body)
+    n = DATA_PLANE_OBJECTS
+    lat = np.empty(n, dtype=np.float64)
+    succ = np.zeros(n, dtype=bool)
+    # One urandom read for all key suffixes (4 bytes -> 8 hex chars each)
+    raw = os.urandom(4*n)
+    tokens = [raw[i*4:(i+1)*4].hex() for i in range(n)]
+
+    # Each PUT+GET pair is independent; a worker only writes its own slot i
+    def _one(i):
+        key = f"obj-{i:03d}-{tokens[i]}.txt"
+
+        s3 = _client()
+        t0 = time.monotonic_ns()
+        s3.put_object(Bucket=bucket, Key=key, Body=_BODY)
         # immediate read-after-write
         try:
-            obj = S3.get_object(Bucket=bucket, Key=key)
-            _ = obj["Body"].read()
+            if VERIFY_BODY:
+                obj = s3.get_object(Bucket=bucket, Key=key)
+                _ = obj["Body"].read()
+            else:
+                s3.head_object(Bucket=bucket, Key=key)
         except ClientError as e:
             # Should not happen under strong consistency
-            rows.append({"key": key, "success": False, "latency_ms": None, "error": str(e)})
-            continue
-        t1 = time.perf_counter()
-        rows.append({"key": key, "success": True, "latency_ms": round((t1 - t0)*1000, 2)})
-
-    df = pd.DataFrame(rows)
-    df.to_csv("data_plane_results.csv", index=False)
+            return {"key": key, "success": False, "latency_ms": None, "error": str(e)}
+        t1 = time.monotonic_ns()
+        latency_ms = (t1 - t0) / 1_000_000
+        lat[i] = latency_ms
+        succ[i] = True
+        return {"key": key, "success": True, "latency_ms": round(latency_ms, 2)}
+
+    # Rows are streamed to disk as each PUT+HEAD pair completes, so one slow
+    # request never holds back rows that already finished
+    with open("data_plane_results.csv", "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=["key", "success", "latency_ms", "error"])
+        w.writeheader()
+        if DATA_PLANE_WORKERS > 1:
+            with ThreadPoolExecutor(max_workers=DATA_PLANE_WORKERS) as ex:
+                futures = [ex.submit(_one, i) for i in range(n)]
+                for fut in as_completed(futures):
+                    w.writerow(fut.result())
+        else:
+            for i in range(n):
+                w.writerow(_one(i))
 
-    succ = df[df["success"]]
     stats = {}
-    if not succ.empty:
-        lat = succ["latency_ms"].astype(float).to_numpy()
+    ok = lat[succ]
+    if ok.size:
+        # One sort for all order statistics
+        median, p95, p99, mx = np.quantile(ok, [0.5, 0.95, 0.99, 1.0])
         stats = {
-            "count": int(len(lat)),
-            "success_rate": round(100*len(succ)/len(df), 2),
-            "mean_ms": round(np.mean(lat), 2),
-            "median_ms": round(np.median(lat), 2),
-            "p95_ms": round(np.percentile(lat, 95), 2),
-            "p99_ms": round(np.percentile(lat, 99), 2),
-            "max_ms": round(np.max(lat), 2),
+            "count": int(ok.size),
+            "success_rate": round(100*ok.size/n, 2),
+            "mean_ms": round(ok.mean(), 2),
+            "median_ms": round(median, 2),
+            "p95_ms": round(p95, 2),
+            "p99_ms": round(p99, 2),
+            "max_ms": round(mx, 2),
         }
     return stats
 
@@ -114,18 +148,23 @@ def put_lifecycle(bucket, config):
 
 def get_lifecycle(bucket):
     # Returns normalized dict form of current lifecycle config
-    resp = S3.get_bucket_lifecycle_configuration(Bucket=bucket)
+    resp = _client().get_bucket_lifecycle_configuration(Bucket=bucket)
     return {"Rules": resp["Rules"]}
 
 def poll_until_match(bucket, expected_config, timeout_s=TIMEOUT_SECONDS):
-    start = time.perf_counter()
+    # Integer-ns monotonic clock; ages below are converted to seconds
+    start = time.monotonic_ns()
     polls = 0
     first_snapshot = None
     first_snapshot_age = None
+    # Expected configs carry a single unique rule; compare just its ID and Days
+    expected_rule = expected_config["Rules"][0]
+    expected_id = expected_rule["ID"]
+    expected_days = expected_rule["Expiration"]["Days"]
 
     # 1s polling for EARLY_DENSE_SECONDS, then every LATE_INTERVAL_SECONDS
     while True:
-        elapsed = time.perf_counter() - start
+        elapsed = (time.monotonic_ns() - start) / 1e9
         if elapsed > timeout_s:
             return {
                 "matched": False,
@@ -138,13 +177,14 @@ def poll_until_match(bucket, expected_config, timeout_s=TIMEOUT_SECONDS):
         try:
             current = get_lifecycle(bucket)
             polls += 1
-            observed_age = time.perf_counter() - start
+            observed_age = (time.monotonic_ns() - start) / 1e9
 
             if first_snapshot is None:
                 first_snapshot = current
                 first_snapshot_age = observed_age
 
-            if equal_lifecycle(current, expected_config):
+            rules = current["Rules"]
+            if rules and rules[0]["ID"] == expected_id and rules[0]["Expiration"]["Days"] == expected_days:
                 return {
                     "matched": True,
                     "elapsed": observed_age,
@@ -160,64 +200,80 @@ def poll_until_match(bucket, expected_config, timeout_s=TIMEOUT_SECONDS):
                 raise
 
         # sleep cadence
-        current_age = time.perf_counter() - start
+        current_age = (time.monotonic_ns() - start) / 1e9
         if current_age < EARLY_DENSE_SECONDS:
             time.sleep(1)
         else:
             time.sleep(LATE_INTERVAL_SECONDS)
 
 def test_control_plane(bucket):
-    rows = []
+    fieldnames = [
+        "iteration", "matched", "propagation_sec", "polls", "timeout_used",
+        "first_read_sec", "first_read_rule", "first_read_matched", "first_read_stale",
+    ]
+    times = np.empty(CONTROL_PLANE_ITERS, dtype=np.float64)
+    matched = np.zeros(CONTROL_PLANE_ITERS, dtype=bool)
+    first_read_matched = np.zeros(CONTROL_PLANE_ITERS, dtype=bool)
+    first_read_stale = np.zeros(CONTROL_PLANE_ITERS, dtype=bool)
     prev_cfg = None
-    for i in range(CONTROL_PLANE_ITERS):
-        rule_id = f"expire-{uuid.uuid4()}"
-        cfg = {
-            "Rules": [{
-                "ID": rule_id,
-                "Status": "Enabled",
-                "Filter": {"Prefix": ""},
-                "Expiration": {"Days": 30 + (i % 7)}
-            }]
-        }
-        put_lifecycle(bucket, cfg)
-        result = poll_until_match(bucket, cfg, TIMEOUT_SECONDS)
-        first_read = result["first_read"]
-        first_read_rule = None
-        if first_read and first_read.get("Rules"):
-            first_read_rule = first_read["Rules"][0].get("ID")
-
-        first_matches = bool(first_read and equal_lifecycle(first_read, cfg))
-        first_is_prev = bool(first_read and prev_cfg and equal_lifecycle(first_read, prev_cfg))
-
-        rows.append({
-            "iteration": i,
-            "matched": result["matched"],
-            "propagation_sec": round(result["elapsed"], 3),
-            "polls": result["polls"],
-            "timeout_used": TIMEOUT_SECONDS,
-            "first_read_sec": round(result["first_read_elapsed"], 3) if result["first_read_elapsed"] is not None else None,
-            "first_read_rule": first_read_rule,
-            "first_read_matched": first_matches,
-            "first_read_stale": first_is_prev,
-        })
-        prev_cfg = cfg
-        time.sleep(10)  # <-- important: allow real propagation
-
-    df = pd.DataFrame(rows)
-    df.to_csv("control_plane_results.csv", index=False)
+    with open("control_plane_results.csv", "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w.writeheader()
+        for i in range(CONTROL_PLANE_ITERS):
+            rule_id = f"expire-{uuid.uuid4()}"
+            cfg = {
+                "Rules": [{
+                    "ID": rule_id,
+                    "Status": "Enabled",
+                    "Filter": {"Prefix": ""},
+                    "Expiration": {"Days": 30 + (i % 7)}
+                }]
+            }
+            put_lifecycle(bucket, cfg)
+            result = poll_until_match(bucket, cfg, TIMEOUT_SECONDS)
+            first_read = result["first_read"]
+            first_read_rule = None
+            if first_read and first_read.get("Rules"):
+                first_read_rule = first_read["Rules"][0].get("ID")
+
+            first_matches = bool(first_read and equal_lifecycle(first_read, cfg))
+            first_is_prev = bool(first_read and prev_cfg and equal_lifecycle(first_read, prev_cfg))
+
+            propagation_sec = round(result["elapsed"], 3)
+            times[i] = propagation_sec
+            matched[i] = result["matched"]
+            first_read_matched[i] = first_matches
+            first_read_stale[i] = first_is_prev
+            w.writerow({
+                "iteration": i,
+                "matched": result["matched"],
+                "propagation_sec": propagation_sec,
+                "polls": result["polls"],
+                "timeout_used": TIMEOUT_SECONDS,
+                "first_read_sec": round(result["first_read_elapsed"], 3) if result["first_read_elapsed"] is not None else None,
+                "first_read_rule": first_read_rule,
+                "first_read_matched": first_matches,
+                "first_read_stale": first_is_prev,
+            })
+            # Iterations are slow; flush so a crash still leaves partial data
+            f.flush()
+            prev_cfg = cfg
+            # Propagation of this config completed within result["elapsed"];
+            # only top up to MIN_GAP_SECONDS of quiet time so slow iterations
+            # don't pay extra idle on top of their propagation wait.
+            gap = max(0.0, MIN_GAP_SECONDS - result["elapsed"])
+            time.sleep(gap)
 
     # Stats including virtual timeouts at 180s and 300s
-    times = df["propagation_sec"].to_numpy()
-    matched = df["matched"].to_numpy()
     succ_times = times[matched]
 
     def pct(x): return round(float(x), 2)
 
-    first_match_rate = df["first_read_matched"].fillna(False).astype(float).mean()
-    stale_rate = df["first_read_stale"].fillna(False).astype(float).mean()
+    first_match_rate = first_read_matched.mean()
+    stale_rate = first_read_stale.mean()
 
     stats = {
-        "n": len(df),
+        "n": CONTROL_PLANE_ITERS,
         "success_rate_600s_%": pct(100*np.mean(matched)),
         "success_rate_180s_%": pct(100*np.mean(times <= 180.0)),
         "success_rate_300s_%": pct(100*np.mean(times <= 300.0)),
@@ -1,19 +1,32 @@
-import os, time, json, uuid, datetime, random
-import boto3
-from botocore.config import Config
+import os, sys, csv, time, json, uuid, datetime, random
 from botocore.exceptions import ClientError
 import numpy as np
-import pandas as pd
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+# Shared client factory lives one level up in verification/test
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from s3_utils import AWS_REGION, get_s3, thread_client as _client
+
 # ---------- Config ----------
-AWS_REGION = os.environ.get("AWS_REGION", "us-west-2")
-SESSION = boto3.Session(region_name=AWS_REGION, profile_name=os.environ.get("AWS_PROFILE"))
-S3 = SESSION.client("s3", config=Config(retries={"max_attempts": 10, "mode": "standard"}))
+# S3 is shared; worker threads use their own _client() (see s3_utils)
+S3 = get_s3()
 
 TEST_BUCKET = f"cs6620-s3-consistency-concurrent-{datetime.datetime.utcnow().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
 DATA_PLANE_OBJECTS = 100
 CONTROL_PLANE_ITERS = 100
+# Payload content is irrelevant to the consistency check; keys stay unique
+_BODY = b"x" * 1024
+# Read-after-write only needs visibility; HEAD skips the body transfer.
+# Set True to require a full GET + body read instead.
+VERIFY_BODY = False
+
+# Shared pool for racer pollers; reused across iterations instead of
+# spawning a fresh executor each time
+POOL = ThreadPoolExecutor(max_workers=8)
+# GETs per poll tick, staggered across the tick's sleep (pipelined samples,
+# not duplicate-request hedges); separate pool so pollers never wait on themselves
+GETS_PER_TICK = 3
+GET_POOL = ThreadPoolExecutor(max_workers=GETS_PER_TICK)
 
 # ---------- Helpers ----------
 def create_bucket(bucket, region):
@@ -26,17 +39,17 @@ def create_bucket(bucket, region):
 
 def delete_bucket_and_contents(bucket):
     try:
-        # Delete objects
-        resp = S3.list_objects_v2(Bucket=bucket)
-        while True:
-            if "Contents" in resp:
-                to_delete = [{"Key": obj["Key"]} for obj in resp["Contents"]]
-                if to_delete:
-                    S3.delete_objects(Bucket=bucket, Delete={"Objects": to_delete})
-            if resp.get("IsTruncated"):
-                resp = S3.list_objects_v2(Bucket=bucket, ContinuationToken=resp["NextContinuationToken"])
-            else:
-                break
+        # Delete objects: collect all keys, then fire 1000-key batches in parallel
+        keys = [
+            {"Key": obj["Key"]}
+            for page in S3.get_paginator("list_objects_v2").paginate(Bucket=bucket)
+            for obj in page.get("Contents", [])
+        ]
+        chunks = [keys[i:i + 1000] for i in range(0, len(keys), 1000)]
+        if chunks:
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                # Quiet=True: response only lists failures
+                list(ex.map(lambda ch: S3.delete_objects(Bucket=bucket, Delete={"Objects": ch, "Quiet": True}), chunks))
         # Remove lifecycle (just in case)
         try:
             S3.delete_bucket_lifecycle(Bucket=bucket)
@@ -58,26 +71,28 @@ def lifecycle_config(days:int, rule_id:str):
     }
 
 # ---------- Test 2.1: Data Plane Concurrent ----------
-def verify_atomic_write(bucket, index):
-    key = f"concurrent-obj-{index}-{uuid.uuid4().hex[:6]}"
-    body = b"x" * 1024
+def verify_atomic_write(bucket, index, token):
+    key = f"concurrent-obj-{index}-{token}"
     
     # 1. Write
-    t0 = time.perf_counter()
+    t0 = time.monotonic_ns()
     try:
-        S3.put_object(Bucket=bucket, Key=key, Body=body)
-        t_write_ack = time.perf_counter()
+        _client().put_object(Bucket=bucket, Key=key, Body=_BODY)
+        t_write_ack = time.monotonic_ns()
         
         # 2. Immediate Read (Strong Consistency Check)
-        S3.get_object(Bucket=bucket, Key=key)
-        t_read_ack = time.perf_counter()
+        if VERIFY_BODY:
+            _client().get_object(Bucket=bucket, Key=key)["Body"].read()
+        else:
+            _client().head_object(Bucket=bucket, Key=key)
+        t_read_ack = time.monotonic_ns()
         
         return {
             "key": key,
             "success": True, 
-            "write_latency_ms": (t_write_ack - t0) * 1000,
-            "read_latency_ms": (t_read_ack - t_write_ack) * 1000,
-            "total_latency_ms": (t_read_ack - t0) * 1000
+            "write_latency_ms": (t_write_ack - t0) / 1_000_000,
+            "read_latency_ms": (t_read_ack - t_write_ack) / 1_000_000,
+            "total_latency_ms": (t_read_ack - t0) / 1_000_000
         }
     except ClientError as e:
         return {
@@ -88,22 +103,31 @@ def verify_atomic_write(bucket, index):
 
 def test_data_plane_concurrent(bucket):
     print(f"   Launch: {DATA_PLANE_OBJECTS} parallel threads...")
-    results = []
-    with ThreadPoolExecutor(max_workers=20) as executor:
-        futures = [executor.submit(verify_atomic_write, bucket, i) for i in range(DATA_PLANE_OBJECTS)]
-        for f in as_completed(futures):
-            results.append(f.result())
-    
-    df = pd.DataFrame(results)
-    df.to_csv("data_plane_concurrent_results.csv", index=False)
+    fieldnames = ["key", "success", "write_latency_ms", "read_latency_ms", "total_latency_ms", "error"]
+    n = 0
+    lat = []
+    # One urandom read for all key suffixes (3 bytes -> 6 hex chars each)
+    raw = os.urandom(3*DATA_PLANE_OBJECTS)
+    tokens = [raw[i*3:(i+1)*3].hex() for i in range(DATA_PLANE_OBJECTS)]
+    # Rows are streamed to disk from the main thread as futures complete
+    with open("data_plane_concurrent_results.csv", "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w.writeheader()
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            futures = [executor.submit(verify_atomic_write, bucket, i, tokens[i]) for i in range(DATA_PLANE_OBJECTS)]
+            for fut in as_completed(futures):
+                row = fut.result()
+                w.writerow(row)
+                n += 1
+                if row["success"]:
+                    lat.append(row["total_latency_ms"])
 
-    succ = df[df["success"] == True]
     stats = {}
-    if not succ.empty:
-        lat = succ["total_latency_ms"].astype(float).to_numpy()
+    if lat:
+        lat = np.asarray(lat, dtype=np.float64)
         stats = {
             "count": int(len(lat)),
-            "success_rate": round(100*len(succ)/len(df), 2),
+            "success_rate": round(100*len(lat)/n, 2),
             "mean_ms": round(np.mean(lat), 2),
             "median_ms": round(np.median(lat), 2),
             "p95_ms": round(np.percentile(lat, 95), 2),
@@ -113,90 +137,121 @@ def test_data_plane_concurrent(bucket):
     return stats
 
 # ---------- Test 2.2: Control Plane Racer ----------
+def rule_visible(bucket, expected_rule_id):
+    try:
+        resp = _client().get_bucket_lifecycle_configuration(Bucket=bucket)
+    except ClientError:
+        return False # Lifecycle might not exist yet
+    # Check if our NEW rule ID is present
+    return any(r["ID"] == expected_rule_id for r in resp.get("Rules", []))
+
+def _timed_rule_visible(bucket, expected_rule_id):
+    # Stamp each GET with its own response time so staggered GETs keep
+    # their individual position on the timeline
+    visible = rule_visible(bucket, expected_rule_id)
+    return visible, time.monotonic_ns()
+
 def smart_poll_until_match(bucket, expected_rule_id, start_time, timeout=600):
     """
     Uses Exponential Backoff + Jitter to minimize API calls (cost) 
-    while maintaining precision.
+    while maintaining precision. Each poll tick pipelines GETS_PER_TICK
+    GETs staggered evenly across the tick's sleep, so they sample
+    distinct moments and tighten the detected propagation edge.
+    start_time and the returned detected_at are time.monotonic_ns() values.
     """
     attempt = 0
+    api_calls = 0
     base_sleep = 0.5
     max_sleep = 10.0
     
-    while (time.perf_counter() - start_time) < timeout:
+    timeout_ns = timeout * 1_000_000_000
+    while (time.monotonic_ns() - start_time) < timeout_ns:
         attempt += 1
-        try:
-            # Get current config
-            resp = S3.get_bucket_lifecycle_configuration(Bucket=bucket)
-            rules = resp.get("Rules", [])
-            
-            # Check if our NEW rule ID is present
-            if any(r["ID"] == expected_rule_id for r in rules):
-                return {
-                    "found": True, 
-                    "attempts": attempt, 
-                    "detected_at": time.perf_counter()
-                }
-        except ClientError:
-            pass # Lifecycle might not exist yet
+        # Exponential Backoff with jitter floored at base_sleep
+        # Sleep = random_between(base, min(cap, base * 2^attempt))
+        # The shift is bounded: base * 2^6 already exceeds the cap, so later
+        # attempts skip the arithmetic. The base_sleep floor avoids near-zero
+        # sleeps that would burn extra GETs.
+        cap = max_sleep if attempt >= 6 else base_sleep * (1 << attempt)
+        prev = min(cap, max_sleep)
+        sleep_time = random.uniform(base_sleep, prev)
+        step = sleep_time / GETS_PER_TICK
+        
+        # Fire GETS_PER_TICK GETs one step apart; stop early once one has
+        # seen the rule. Every fired request is counted so API cost stays honest
+        futures = []
+        for i in range(GETS_PER_TICK):
+            if i:
+                time.sleep(step)
+                if any(f.done() and f.result()[0] for f in futures):
+                    break
+            futures.append(GET_POOL.submit(_timed_rule_visible, bucket, expected_rule_id))
+            api_calls += 1
+        
+        hits = [t for visible, t in (f.result() for f in futures) if visible]
+        if hits:
+            return {
+                "found": True, 
+                "attempts": api_calls, 
+                "detected_at": min(hits)
+            }
         
-        # Exponential Backoff with "Full Jitter"
-        # Sleep = random_between(0, min(cap, base * 2^attempt))
-        sleep_time = random.uniform(0, min(max_sleep, base_sleep * (2 ** attempt)))
-        time.sleep(sleep_time)
+        time.sleep(step)
 
-    return {"found": False, "attempts": attempt, "detected_at": None}
+    return {"found": False, "attempts": api_calls, "detected_at": None}
 
 def test_control_plane_racer(bucket):
     print(f"   Running Control Plane Racer ({CONTROL_PLANE_ITERS} iterations)...")
-    stats = []
+    found_delays = []
+    with open("control_plane_racer_results.csv", "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=["iteration", "found", "delay_sec", "api_calls"])
+        w.writeheader()
     
-    for i in range(CONTROL_PLANE_ITERS):
-        rule_id = f"rule-{uuid.uuid4().hex}"
-        config = lifecycle_config(30, rule_id)
+        for i in range(CONTROL_PLANE_ITERS):
+            rule_id = f"rule-{uuid.uuid4().hex}"
+            config = lifecycle_config(30, rule_id)
         
-        # Mark time 0
-        t0 = time.perf_counter()
+            # Mark time 0
+            t0 = time.monotonic_ns()
         
-        with ThreadPoolExecutor(max_workers=2) as executor:
             # THREAD A: The Poller (Starts IMMEDIATELY)
             # We pass t0 so it knows when the "race" began
-            poller_future = executor.submit(smart_poll_until_match, bucket, rule_id, t0)
-            
-            # THREAD B: The Writer
+            poller_future = POOL.submit(smart_poll_until_match, bucket, rule_id, t0)
+        
+            # MAIN THREAD: The Writer
             # We introduce a tiny sleep to ensure Poller is alive, then Write
             time.sleep(0.1) 
             S3.put_bucket_lifecycle_configuration(Bucket=bucket, LifecycleConfiguration=config)
-            
+        
             # Wait for result
             result = poller_future.result()
         
-        if result["found"]:
-            propagation_delay = result["detected_at"] - t0
-        else:
-            propagation_delay = None
+            if result["found"]:
+                propagation_delay = (result["detected_at"] - t0) / 1e9
+            else:
+                propagation_delay = None
 
-        stats.append({
-            "iteration": i, 
-            "found": result["found"],
-            "delay_sec": propagation_delay, 
-            "api_calls": result["attempts"]
-        })
-        
-        # Don't sleep 10s. Just randomize rule IDs (which you do) 
-        # and proceed. This stresses the control plane harder.
+            w.writerow({
+                "iteration": i, 
+                "found": result["found"],
+                "delay_sec": propagation_delay, 
+                "api_calls": result["attempts"]
+            })
+            f.flush()
+            if result["found"]:
+                found_delays.append(propagation_delay)
         
-    df = pd.DataFrame(stats)
-    df.to_csv("control_plane_racer_results.csv", index=False)
+            # Don't sleep 10s. Just randomize rule IDs (which you do) 
+            # and proceed. This stresses the control plane harder.
 
     # Stats
-    found_df = df[df["found"] == True]
-    delays = found_df["delay_sec"].astype(float).to_numpy()
+    delays = np.asarray(found_delays, dtype=np.float64)
     
     def pct(x): return round(float(x), 2)
 
     stats_summary = {
-        "n": len(df),
-        "success_rate_%": pct(100*len(found_df)/len(df)),
+        "n": CONTROL_PLANE_ITERS,
+        "success_rate_%": pct(100*len(delays)/CONTROL_PLANE_ITERS),
     }
     
     if len(delays) > 0:
@@ -226,6 +281,8 @@ if __name__ == "__main__":
 
         print("\nCSV written: data_plane_concurrent_results.csv, control_plane_racer_results.csv")
     finally:
+        POOL.shutdown(wait=True)
+        GET_POOL.shutdown(wait=True)
         print("\nCleaning up …")
         delete_bucket_and_contents(TEST_BUCKET)
         print("Done.")
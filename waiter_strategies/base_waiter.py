@@ -3,11 +3,152 @@ Base Waiter Strategy Framework
 Provides common functionality for all waiter strategy implementations
 """
 import boto3
+import numpy as np
 import time
 import json
+import logging
+import logging.handlers
 import random
+import re
+import sys
+import queue
+import threading
+import uuid
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout,
+    as_completed, wait,
+)
 from datetime import datetime
+from operator import itemgetter
+from typing import NamedTuple
+from botocore.config import Config
+
+try:
+    import orjson  # optional, much faster JSON encoder
+except ImportError:
+    orjson = None
+
+# Per-test progress goes through this logger rather than print(): INFO lines
+# (test outcomes) flush immediately, DEBUG detail is buffered in memory.
+# The logger is shared by every strategy, so it stays at DEBUG and each
+# instance skips its own debug calls unless created with verbose=True
+logger = logging.getLogger('waiter')
+if not logger.handlers:
+    logger.setLevel(logging.DEBUG)
+    _stream = logging.StreamHandler(sys.stdout)
+    _stream.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.INFO, target=_stream))
+    logger.propagate = False
+
+# Hedged GETs: once enough samples exist, a GET slower than the rolling
+# HEDGE_PERCENTILE latency gets a duplicate request; first response wins
+HEDGE_WINDOW = 100
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 95
+
+# (ID, Status) of a lifecycle rule; S3 always returns both (ID is generated
+# when a PUT omits it), so no .get() defaults are needed
+_rule_key = itemgetter('ID', 'Status')
+
+
+# EventBridge sees S3 control-plane calls only through CloudTrail, which logs
+# PutBucketLifecycleConfiguration under its older name
+LIFECYCLE_EVENT_NAMES = ['PutBucketLifecycle', 'PutBucketLifecycleConfiguration']
+_EVENT_TARGET_ID = 'waiter-queue'
+
+
+def _subscription_name(bucket):
+    # Shared by the queue and the rule; EventBridge caps rule names at 64 chars.
+    # Unique per subscription: SQS refuses to re-create a queue name for 60s
+    # after deleting it, which would break back-to-back suites on one bucket
+    return f"s3-waiter-{re.sub(r'[^A-Za-z0-9_-]', '-', bucket)[:45]}-{uuid.uuid4().hex[:8]}"
+
+
+def subscribe_to_lifecycle_events(bucket):
+    """
+    Deliver the bucket's lifecycle PUT events to a dedicated SQS queue
+    
+    Requires CloudTrail management events to be enabled in the account.
+    
+    Args:
+        bucket: S3 bucket to watch
+        
+    Returns:
+        tuple: (subscription name, URL of the queue receiving the events)
+    """
+    name = _subscription_name(bucket)
+    sqs = boto3.client('sqs')
+    events = boto3.client('events')
+    
+    queue_url = sqs.create_queue(QueueName=name)['QueueUrl']
+    rule_created = False
+    try:
+        queue_arn = sqs.get_queue_attributes(
+            QueueUrl=queue_url, AttributeNames=['QueueArn']
+        )['Attributes']['QueueArn']
+        rule_arn = events.put_rule(
+            Name=name,
+            EventPattern=json.dumps({
+                'source': ['aws.s3'],
+                'detail-type': ['AWS API Call via CloudTrail'],
+                'detail': {
+                    'eventSource': ['s3.amazonaws.com'],
+                    'eventName': LIFECYCLE_EVENT_NAMES,
+                    'requestParameters': {'bucketName': [bucket]},
+                },
+            }),
+        )['RuleArn']
+        rule_created = True
+        sqs.set_queue_attributes(QueueUrl=queue_url, Attributes={'Policy': json.dumps({
+            'Version': '2012-10-17',
+            'Statement': [{
+                'Effect': 'Allow',
+                'Principal': {'Service': 'events.amazonaws.com'},
+                'Action': 'sqs:SendMessage',
+                'Resource': queue_arn,
+                'Condition': {'ArnEquals': {'aws:SourceArn': rule_arn}},
+            }],
+        })})
+        events.put_targets(Rule=name, Targets=[{'Id': _EVENT_TARGET_ID, 'Arn': queue_arn}])
+    except Exception:
+        # Don't leave a half-built subscription behind; best effort, the
+        # original error is the one worth reporting
+        try:
+            if rule_created:
+                events.remove_targets(Rule=name, Ids=[_EVENT_TARGET_ID])
+                events.delete_rule(Name=name)
+            sqs.delete_queue(QueueUrl=queue_url)
+        except Exception as e:
+            logger.warning("Could not clean up event subscription for %s: %s", bucket, e)
+        raise
+    return name, queue_url
+
+
+def unsubscribe_from_lifecycle_events(name, queue_url):
+    """
+    Remove the rule and queue created by subscribe_to_lifecycle_events
+    
+    Args:
+        name: Subscription name returned by subscribe_to_lifecycle_events
+        queue_url: Queue URL returned by subscribe_to_lifecycle_events
+    """
+    events = boto3.client('events')
+    events.remove_targets(Rule=name, Ids=[_EVENT_TARGET_ID])
+    events.delete_rule(Name=name)
+    boto3.client('sqs').delete_queue(QueueUrl=queue_url)
+
+
+class PollAttempt(NamedTuple):
+    """
+    One entry of a test's polling_history (converted to a dict on save)
+    """
+    attempt: int
+    elapsed_at_check: float
+    get_duration: float
+    matched: bool
 
 
 class BaseWaiterStrategy(ABC):
@@ -16,18 +157,72 @@ class BaseWaiterStrategy(ABC):
     All strategy implementations should inherit from this class
     """
     
-    def __init__(self, bucket_name, strategy_name):
+    def __init__(self, bucket_name, strategy_name, verbose=False):
         """
         Initialize the waiter strategy
         
         Args:
             bucket_name: S3 bucket name for testing
             strategy_name: Human-readable name for this strategy
+            verbose: Log per-poll detail (DEBUG) in addition to test outcomes
         """
-        self.s3_client = boto3.client('s3')
+        self.verbose = verbose
+        # Shared by all worker threads; in-flight GETs multiplex over one
+        # pool of keep-alive connections sized well above the default 10
+        self.s3_client = boto3.client('s3', config=Config(
+            max_pool_connections=64,
+            tcp_keepalive=True,
+        ))
         self.bucket_name = bucket_name
         self.strategy_name = strategy_name
+        # e.g. "Baseline-3s-180s" -> "baseline-3s-180s_results.json"; parentheses
+        # are dropped and any other unsafe run of characters becomes "_"
+        safe_name = re.sub(r'[()]', '', strategy_name.lower())
+        self._results_filename = re.sub(r'[^a-z0-9_.-]+', '_', safe_name) + '_results.json'
         self.results = []
+        self._results_lock = threading.Lock()
+        # Per-worker state (current bucket, simulation state)
+        self._local = threading.local()
+        # Rolling GET latencies feeding the hedge threshold
+        self._get_durations = deque(maxlen=HEDGE_WINDOW)
+        self._hedge_lock = threading.Lock()
+        self._hedge_threshold = None
+        self._hedge_stale = False
+        # Created per run_test_suite (two GETs per bucket worker) and shut
+        # down when it returns; without it GETs simply run inline
+        self._hedge_pool = None
+        
+        # Optional lifecycle event listeners (run_test_suite(use_events=True)):
+        # bucket -> (subscription name, queue URL), and bucket -> (rule ID, ready event) of the
+        # test currently running on it
+        self._sqs = None
+        self._event_queues = {}
+        self._event_waiters = {}
+        self._event_threads = []
+        self._events_stop = threading.Event()
+    
+    def _current_bucket(self):
+        """
+        Bucket used by the calling thread
+        
+        Returns:
+            str: Bucket assigned by run_test_suite, or bucket_name by default
+        """
+        return getattr(self._local, 'bucket_name', self.bucket_name)
+    
+    def _ready_event(self):
+        """
+        Event that wakes the calling thread's poll wait early
+        
+        Set it when propagation is known to have completed (e.g. by a
+        simulation timer or an external notification listener).
+        
+        Returns:
+            threading.Event: Per-thread ready event
+        """
+        if not hasattr(self._local, 'ready_event'):
+            self._local.ready_event = threading.Event()
+        return self._local.ready_event
     
     @abstractmethod
     def calculate_next_interval(self, elapsed_time, check_count):
@@ -57,6 +252,73 @@ class BaseWaiterStrategy(ABC):
         """
         pass
     
+    def _compute_timeout(self):
+        """
+        Timeout for the test about to start, read once before polling
+        
+        Returns:
+            float: Seconds after the PUT at which the poll loop gives up
+        """
+        return getattr(self, 'timeout_seconds', float('inf'))
+    
+    def _start_event_listeners(self, buckets):
+        """
+        Subscribe each bucket and start one SQS listener thread per queue
+        
+        Args:
+            buckets: Buckets the suite will run on
+        """
+        self._sqs = boto3.client('sqs')
+        self._events_stop.clear()
+        for bucket in buckets:
+            name, queue_url = subscribe_to_lifecycle_events(bucket)
+            self._event_queues[bucket] = (name, queue_url)
+            thread = threading.Thread(
+                target=self._listen_for_events, args=(bucket, queue_url), daemon=True
+            )
+            thread.start()
+            self._event_threads.append(thread)
+    
+    def _listen_for_events(self, bucket, queue_url):
+        """
+        Long-poll a bucket's queue and wake the test whose PUT was delivered
+        """
+        while not self._events_stop.is_set():
+            try:
+                resp = self._sqs.receive_message(
+                    QueueUrl=queue_url, WaitTimeSeconds=20, MaxNumberOfMessages=1
+                )
+            except Exception as e:
+                logger.warning("Event listener for %s stopped: %s", bucket, e)
+                return
+            for msg in resp.get('Messages', ()):
+                waiter = self._event_waiters.get(bucket)
+                # Rule IDs appear as quoted JSON strings in the event body
+                if waiter is not None and f'"{waiter[0]}"' in msg['Body']:
+                    waiter[1].set()
+                # Tests on a bucket run one at a time, so anything else is
+                # a late event from an earlier test
+                self._sqs.delete_message(QueueUrl=queue_url, ReceiptHandle=msg['ReceiptHandle'])
+    
+    def _stop_event_listeners(self):
+        """
+        Stop the listener threads and delete the rules and queues
+        
+        Waits for in-flight receive_message calls (up to their 20s long
+        poll) so no listener is still reading a queue as it is deleted.
+        """
+        self._events_stop.set()
+        for thread in self._event_threads:
+            thread.join()
+        self._event_threads.clear()
+        for bucket, (name, queue_url) in self._event_queues.items():
+            try:
+                unsubscribe_from_lifecycle_events(name, queue_url)
+            except Exception as e:
+                logger.warning("Could not remove event subscription for %s: %s", bucket, e)
+        self._event_queues.clear()
+        self._event_waiters.clear()
+    
     def generate_lifecycle_config(self, test_id):
         """
         Generate a unique lifecycle configuration for testing
@@ -78,40 +340,100 @@ class BaseWaiterStrategy(ABC):
             ]
         }
     
-    def check_configuration_match(self, expected_config):
+    def _rules_key(self, config):
         """
-        Check if current S3 lifecycle configuration matches expected
+        Project a lifecycle configuration onto the fields we compare
         
         Args:
-            expected_config: The lifecycle configuration we expect to see
+            config: Lifecycle configuration (or GET response) with 'Rules'
             
         Returns:
-            bool: True if configurations match, False otherwise
+            frozenset: {(ID, Status), ...}; independent of the order S3
+            returns rules in (rule IDs are unique within a configuration)
         """
-        try:
-            response = self.s3_client.get_bucket_lifecycle_configuration(
-                Bucket=self.bucket_name
-            )
-            current_rules = response.get('Rules', [])
-            expected_rules = expected_config['Rules']
+        return frozenset(map(_rule_key, config.get('Rules', ())))
+    
+    def _get_lifecycle(self, bucket):
+        """
+        Fetch the bucket lifecycle configuration, recording its latency
+        
+        Args:
+            bucket: S3 bucket name
             
-            # Check if rule count matches
-            if len(current_rules) != len(expected_rules):
-                return False
+        Returns:
+            dict: get_bucket_lifecycle_configuration response
+        """
+        start = time.monotonic()
+        response = self.s3_client.get_bucket_lifecycle_configuration(Bucket=bucket)
+        with self._hedge_lock:
+            self._get_durations.append(time.monotonic() - start)
+            self._hedge_stale = True
+        return response
+    
+    def _hedge_after(self):
+        """
+        Current hedge threshold, recomputed only after new samples arrive
+        
+        Returns:
+            float or None: Seconds to wait before hedging, None while warming up
+        """
+        with self._hedge_lock:
+            if self._hedge_stale and len(self._get_durations) >= HEDGE_MIN_SAMPLES:
+                self._hedge_threshold = float(np.percentile(self._get_durations, HEDGE_PERCENTILE))
+                self._hedge_stale = False
+            return self._hedge_threshold
+    
+    def _hedged_get(self, bucket):
+        """
+        GET the lifecycle configuration, duplicating the request if slow
+        
+        Increments the calling thread's hedged_calls per extra request.
+        
+        Args:
+            bucket: S3 bucket name
             
-            # Check if rule IDs and status match
-            for current, expected in zip(current_rules, expected_rules):
-                if current.get('ID') != expected.get('ID'):
-                    return False
-                if current.get('Status') != expected.get('Status'):
-                    return False
+        Returns:
+            dict: Response from whichever request completed first
+        """
+        threshold = self._hedge_after()
+        pool = self._hedge_pool
+        if threshold is None or pool is None:
+            return self._get_lifecycle(bucket)
+        
+        # The first GET can't run inline: the caller must stay free to
+        # return on the hedge's response while the slow one is still out
+        first = pool.submit(self._get_lifecycle, bucket)
+        try:
+            return first.result(timeout=threshold)
+        except FutureTimeout:
+            pass
+        
+        self._local.hedged_calls = getattr(self._local, 'hedged_calls', 0) + 1
+        second = pool.submit(self._get_lifecycle, bucket)
+        done, pending = wait([first, second], return_when=FIRST_COMPLETED)
+        for loser in pending:
+            loser.cancel()
+        return done.pop().result()
+    
+    def check_configuration_match(self, expected_key):
+        """
+        Check if current S3 lifecycle configuration matches expected
+        
+        Args:
+            expected_key: _rules_key() of the configuration we expect to see
             
-            return True
+        Returns:
+            bool: True if configurations match, False otherwise
+        """
+        try:
+            response = self._hedged_get(self._current_bucket())
+            # Rule count, IDs and status all compared in one set equality
+            return self._rules_key(response) == expected_key
             
         except self.s3_client.exceptions.NoSuchLifecycleConfiguration:
             return False
         except Exception as e:
-            print(f"Error checking configuration: {e}")
+            logger.warning("Error checking configuration: %s", e)
             return False
     
     def run_single_test(self, test_id):
@@ -125,18 +447,26 @@ class BaseWaiterStrategy(ABC):
             dict: Test result with detailed metrics
         """
         config = self.generate_lifecycle_config(test_id)
+        # Computed once; each poll compares against this projection
+        expected_key = self._rules_key(config)
+        
+        ready = self._ready_event()
+        ready.clear()
+        if self._event_queues:
+            # Registered before the PUT so its event cannot arrive unclaimed
+            self._event_waiters[self._current_bucket()] = (config['Rules'][0]['ID'], ready)
         
         # === Phase 1: PUT Request ===
-        print(f"  Applying configuration...", end=' ')
-        put_start = time.time()
+        put_start = time.monotonic()
         try:
             self.s3_client.put_bucket_lifecycle_configuration(
-                Bucket=self.bucket_name,
+                Bucket=self._current_bucket(),
                 LifecycleConfiguration=config
             )
-            put_end = time.time()
+            put_end = time.monotonic()
             put_duration = put_end - put_start
-            print(f"✓ ({put_duration:.3f}s)", end='')
+            if self.verbose:
+                logger.debug("  Test %d: Configuration applied (%.3fs), waiting", test_id + 1, put_duration)
         except Exception as e:
             return {
                 'test_id': test_id,
@@ -146,55 +476,49 @@ class BaseWaiterStrategy(ABC):
             }
         
         # === Phase 2: Polling for Propagation ===
-        propagation_start = time.time()
+        # Monotonic clock, read twice per poll; the post-check read doubles
+        # as the next iteration's elapsed time
+        propagation_start = put_end
+        elapsed = 0.0
         check_count = 0
         api_calls = 1  # Count the PUT operation
         polling_history = []  # Track each polling attempt
         
-        print(f"  Waiting", end='')
+        # Fixed up front so the last wait never sleeps past the timeout
+        deadline = propagation_start + self._compute_timeout()
         
-        while True:
-            elapsed = time.time() - propagation_start
-            
-            # Check if we should timeout
-            if self.should_timeout(elapsed, check_count):
-                print(f" ✗ Timeout after {elapsed:.1f}s")
-                return {
-                    'test_id': test_id,
-                    'success': False,
-                    'error': 'Timeout',
-                    'put_duration': put_duration,
-                    'propagation_time': elapsed,
-                    'check_count': check_count,
-                    'api_calls': api_calls,
-                    'polling_history': polling_history,
-                    'timestamp': datetime.now().isoformat()
-                }
-            
-            # Wait before next check
+        while not self.should_timeout(elapsed, check_count):
+            # Wait before next check (returns early if ready is signalled)
             interval = self.calculate_next_interval(elapsed, check_count)
-            time.sleep(interval)
+            # From the last post-check read; no extra clock read per poll
+            remaining = deadline - (propagation_start + elapsed)
+            if remaining <= 0:
+                elapsed = time.monotonic() - propagation_start
+                break
+            ready.wait(min(interval, remaining))
+            ready.clear()
             
             # Perform the check
             check_count += 1
             api_calls += 1
             
-            get_start = time.time()
-            match = self.check_configuration_match(config)
-            get_end = time.time()
-            get_duration = get_end - get_start
+            self._local.hedged_calls = 0
+            t_before = time.monotonic()
+            match = self.check_configuration_match(expected_key)
+            t_after = time.monotonic()
+            # Hedge requests are real API calls too
+            api_calls += self._local.hedged_calls
+            get_duration = t_after - t_before
+            elapsed = t_after - propagation_start
             
             # Record this polling attempt
-            polling_history.append({
-                'attempt': check_count,
-                'elapsed_at_check': time.time() - propagation_start,
-                'get_duration': get_duration,
-                'matched': match
-            })
+            polling_history.append(PollAttempt(check_count, elapsed, get_duration, match))
+            if self.verbose:
+                logger.debug("  Test %d: check %d at %.1fs: matched=%s", test_id + 1, check_count, elapsed, match)
             
             if match:
-                total_time = time.time() - propagation_start
-                print(f" ✓ Success in {total_time:.1f}s ({check_count} checks)")
+                total_time = elapsed
+                logger.info("  Test %d: ✓ Success in %.1fs (%d checks)", test_id + 1, total_time, check_count)
                 return {
                     'test_id': test_id,
                     'success': True,
@@ -205,30 +529,80 @@ class BaseWaiterStrategy(ABC):
                     'polling_history': polling_history,
                     'timestamp': datetime.now().isoformat()
                 }
+        
+        logger.info("  Test %d: ✗ Timeout after %.1fs", test_id + 1, elapsed)
+        return {
+            'test_id': test_id,
+            'success': False,
+            'error': 'Timeout',
+            'put_duration': put_duration,
+            'propagation_time': elapsed,
+            'check_count': check_count,
+            'api_calls': api_calls,
+            'polling_history': polling_history,
+            'timestamp': datetime.now().isoformat()
+        }
     
-    def run_test_suite(self, num_tests=30):
+    def run_test_suite(self, num_tests=30, extra_buckets=(), use_events=False):
         """
         Run the complete test suite
         
+        Tests overlap in time when extra buckets are given: one worker
+        thread per bucket, each running its tests back to back. A bucket
+        holds a single lifecycle configuration, so concurrent tests can
+        never share one without overwriting each other's PUT.
+        
         Args:
             num_tests: Number of test iterations to perform
+            extra_buckets: Additional S3 buckets to run tests on in parallel
+            use_events: Also wake each test when EventBridge delivers its
+                lifecycle PUT (see subscribe_to_lifecycle_events); polling
+                continues as the fallback
             
         Returns:
             list: All test results
         """
+        buckets = [self.bucket_name, *extra_buckets]
+        free_buckets = queue.Queue()
+        for bucket in buckets:
+            free_buckets.put(bucket)
+        
         print(f"\n{'='*60}")
         print(f"Testing Strategy: {self.strategy_name}")
         print(f"{'='*60}")
-        print(f"Running {num_tests} test iterations...\n")
+        print(f"Running {num_tests} test iterations on {len(buckets)} bucket(s)...\n")
         
-        for i in range(num_tests):
-            print(f"Test {i+1}/{num_tests}:")
-            result = self.run_single_test(i)
-            self.results.append(result)
-            
-            # Brief pause between tests to avoid rate limiting
-            time.sleep(2)
+        def run_on_free_bucket(i):
+            bucket = free_buckets.get()
+            self._local.bucket_name = bucket
+            try:
+                logger.info("Test %d/%d: started on %s", i+1, num_tests, bucket)
+                result = self.run_single_test(i)
+                with self._results_lock:
+                    self.results.append(result)
+                
+                # Brief pause between tests to avoid rate limiting
+                time.sleep(2)
+            finally:
+                free_buckets.put(bucket)
         
+        self._hedge_pool = ThreadPoolExecutor(max_workers=2 * len(buckets))
+        try:
+            if use_events:
+                self._start_event_listeners(buckets)
+            with ThreadPoolExecutor(max_workers=len(buckets)) as executor:
+                futures = [executor.submit(run_on_free_bucket, i) for i in range(num_tests)]
+                for future in as_completed(futures):
+                    future.result()
+        finally:
+            if use_events:
+                self._stop_event_listeners()
+            # Don't block on a losing hedge GET that is still in flight
+            self._hedge_pool.shutdown(wait=False)
+            self._hedge_pool = None
+        
+        # Parallel buckets finish out of order; keep the saved layout by test_id
+        self.results.sort(key=itemgetter('test_id'))
         self.analyze_results()
         self.save_results()
         
@@ -250,18 +624,16 @@ class BaseWaiterStrategy(ABC):
         print(f"Success rate:    {(len(successful)/len(self.results))*100:.1f}%")
         
         if successful:
-            # Extract metrics
-            propagation_times = [r['propagation_time'] for r in successful]
-            put_durations = [r['put_duration'] for r in successful]
-            api_calls = [r['api_calls'] for r in successful]
+            # Extract metrics into contiguous float arrays
+            n = len(successful)
+            propagation_times = np.fromiter((r['propagation_time'] for r in successful), dtype=np.float64, count=n)
+            put_durations = np.fromiter((r['put_duration'] for r in successful), dtype=np.float64, count=n)
+            api_calls = np.fromiter((r['api_calls'] for r in successful), dtype=np.int64, count=n)
             
-            # Calculate percentiles
-            import numpy as np
-            p50 = np.percentile(propagation_times, 50)
-            p75 = np.percentile(propagation_times, 75)
-            p90 = np.percentile(propagation_times, 90)
-            p95 = np.percentile(propagation_times, 95)
-            p99 = np.percentile(propagation_times, 99)
+            # Calculate all percentiles in a single pass
+            p50, p75, p90, p95, p99 = np.percentile(propagation_times, [50, 75, 90, 95, 99])
+            prop_min, prop_max = propagation_times.min(), propagation_times.max()
+            prop_mean, prop_std = propagation_times.mean(), propagation_times.std()
             
             print(f"\n📊 Propagation Time Distribution:")
             print(f"  P50 (median):  {p50:.1f}s")
@@ -269,21 +641,21 @@ class BaseWaiterStrategy(ABC):
             print(f"  P90:           {p90:.1f}s")
             print(f"  P95:           {p95:.1f}s")
             print(f"  P99:           {p99:.1f}s")
-            print(f"  Min:           {min(propagation_times):.1f}s")
-            print(f"  Max:           {max(propagation_times):.1f}s")
-            print(f"  Mean:          {np.mean(propagation_times):.1f}s")
-            print(f"  Std Dev:       {np.std(propagation_times):.1f}s")
+            print(f"  Min:           {prop_min:.1f}s")
+            print(f"  Max:           {prop_max:.1f}s")
+            print(f"  Mean:          {prop_mean:.1f}s")
+            print(f"  Std Dev:       {prop_std:.1f}s")
             
             print(f"\n⏱️  PUT Request Performance:")
-            print(f"  Avg duration:  {np.mean(put_durations):.3f}s")
-            print(f"  Min duration:  {min(put_durations):.3f}s")
-            print(f"  Max duration:  {max(put_durations):.3f}s")
+            print(f"  Avg duration:  {put_durations.mean():.3f}s")
+            print(f"  Min duration:  {put_durations.min():.3f}s")
+            print(f"  Max duration:  {put_durations.max():.3f}s")
             
             print(f"\n🔄 API Call Efficiency:")
-            print(f"  Avg calls:     {np.mean(api_calls):.1f}")
-            print(f"  Min calls:     {min(api_calls)}")
-            print(f"  Max calls:     {max(api_calls)}")
-            print(f"  Total calls:   {sum(api_calls)}")
+            print(f"  Avg calls:     {api_calls.mean():.1f}")
+            print(f"  Min calls:     {api_calls.min()}")
+            print(f"  Max calls:     {api_calls.max()}")
+            print(f"  Total calls:   {api_calls.sum()}")
         
         self._display_coverage_analysis()
         print(f"{'='*60}\n")
@@ -349,16 +721,31 @@ class BaseWaiterStrategy(ABC):
             print(f"  Coverage:         Below P50")
             print(f"  ⚠️  Warning: Timeout too short for production use")
     
+    @staticmethod
+    def _serializable(result):
+        """
+        Copy of a test result with PollAttempt records as plain dicts
+        """
+        history = result.get('polling_history')
+        if not history:
+            return result
+        return {**result, 'polling_history': [p._asdict() for p in history]}
+    
     def save_results(self):
         """
         Save test results to JSON file
         """
-        filename = f"{self.strategy_name.lower().replace(' ', '_').replace('(', '').replace(')', '')}_results.json"
-        with open(filename, 'w') as f:
-            json.dump({
-                'strategy_name': self.strategy_name,
-                'total_tests': len(self.results),
-                'successful': len([r for r in self.results if r['success']]),
-                'results': self.results
-            }, f, indent=2)
+        filename = self._results_filename
+        payload = {
+            'strategy_name': self.strategy_name,
+            'total_tests': len(self.results),
+            'successful': sum(1 for r in self.results if r['success']),
+            'results': [self._serializable(r) for r in self.results]
+        }
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(payload, f, indent=2)
         print(f"Results saved to: {filename}")
@@ -4,8 +4,41 @@ Injects realistic propagation delays based on GitHub Issue #25939 data
 """
 
 import random
+import threading
 import time
-from base_waiter import BaseWaiterStrategy
+import numpy as np
+from base_waiter import BaseWaiterStrategy, logger
+
+try:
+    from numba import njit  # optional, compiles the batch sampler
+except ImportError:
+    njit = None
+
+
+def _sample_delays_numpy(cdf, low, high, u1, u2, out):
+    idx = np.searchsorted(cdf, u1, side='right')
+    out[:] = low[idx] + (high[idx] - low[idx]) * u2
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _sample_delays_jit(cdf, low, high, u1, u2, out):
+        for i in range(out.shape[0]):
+            idx = np.searchsorted(cdf, u1[i], side='right')
+            out[i] = low[idx] + (high[idx] - low[idx]) * u2[i]
+else:
+    _sample_delays_jit = None
+
+# The first compiled call costs ~1s of JIT; below this many samples the
+# vectorized NumPy version finishes long before compilation would
+JIT_MIN_SAMPLES = 10_000
+
+
+def _sample_delays(cdf, low, high, u1, u2, out):
+    if _sample_delays_jit is not None and out.shape[0] >= JIT_MIN_SAMPLES:
+        _sample_delays_jit(cdf, low, high, u1, u2, out)
+    else:
+        _sample_delays_numpy(cdf, low, high, u1, u2, out)
 
 
 class SimulatedBaseWaiterStrategy(BaseWaiterStrategy):
@@ -13,8 +46,13 @@ class SimulatedBaseWaiterStrategy(BaseWaiterStrategy):
     Base waiter with simulated eventual consistency delays
     """
     
-    def __init__(self, bucket_name, strategy_name, enable_simulation=True):
-        super().__init__(bucket_name, strategy_name)
+    # Opt-in: wake the poll loop the moment the simulated delay ends. Off by
+    # default because real S3 gives no such signal, so with it on the results
+    # no longer reflect the strategy's polling interval.
+    wake_on_propagation = False
+    
+    def __init__(self, bucket_name, strategy_name, enable_simulation=True, verbose=False):
+        super().__init__(bucket_name, strategy_name, verbose)
         self.enable_simulation = enable_simulation
         # Empirical distribution from GitHub Issue #25939
         self.delay_distribution = {
@@ -26,54 +64,89 @@ class SimulatedBaseWaiterStrategy(BaseWaiterStrategy):
             'P99': 234,  # 99% of requests
             'Max': 312   # Maximum observed
         }
+        # Cumulative probability of each band, and band bounds (seconds):
+        # P0-P50: 0-48, P50-P75: 48-82, ..., P99-Max: 234-312
+        bounds = [0, *self.delay_distribution.values()]
+        self._cdf = np.array([0.50, 0.75, 0.85, 0.90, 0.95, 0.99, 1.00])
+        self._edges = np.array(list(zip(bounds[:-1], bounds[1:])), dtype=np.float64)
+        self._low = np.ascontiguousarray(self._edges[:, 0])
+        self._high = np.ascontiguousarray(self._edges[:, 1])
+        # One delay per test_id, sampled up front by run_test_suite
+        self._suite_delays = None
+        self._rng = np.random.default_rng()
+        # Pre-drawn uniforms consumed by _generate_propagation_delay;
+        # refilled in one vectorized call when exhausted
+        self._buf = self._rng.random(4096)
+        self._buf_i = 0
+        self._buf_lock = threading.Lock()
     
     def _generate_propagation_delay(self):
         """
         Generate realistic propagation delay based on percentile distribution
         """
-        rand = random.random()
+        u1, u2 = self._next_uniforms()
+        # First bucket whose cumulative probability exceeds the draw
+        i = np.searchsorted(self._cdf, u1, side='right')
+        low, high = self._edges[i]
+        return float(low + (high - low) * u2)
+    
+    def _next_uniforms(self):
+        """
+        Take two floats in [0, 1) from the pre-drawn buffer
         
-        if rand < 0.50:
-            # P0-P50: 0-48 seconds
-            return random.uniform(0, 48)
-        elif rand < 0.75:
-            # P50-P75: 48-82 seconds
-            return random.uniform(48, 82)
-        elif rand < 0.85:
-            # P75-P85: 82-120 seconds
-            return random.uniform(82, 120)
-        elif rand < 0.90:
-            # P85-P90: 120-142 seconds
-            return random.uniform(120, 142)
-        elif rand < 0.95:
-            # P90-P95: 142-156 seconds
-            return random.uniform(142, 156)
-        elif rand < 0.99:
-            # P95-P99: 156-234 seconds
-            return random.uniform(156, 234)
-        else:
-            # P99-Max: 234-312 seconds
-            return random.uniform(234, 312)
+        Returns:
+            tuple: (band selector, position within band)
+        """
+        with self._buf_lock:
+            if self._buf_i + 2 > len(self._buf):
+                self._buf = self._rng.random(len(self._buf))
+                self._buf_i = 0
+            i = self._buf_i
+            self._buf_i = i + 2
+            return self._buf[i], self._buf[i + 1]
+    
+    def _generate_propagation_delays(self, n):
+        """
+        Batch variant of _generate_propagation_delay for n samples
+        (compiled with numba when it is installed and n is large)
+        
+        Args:
+            n: Number of delays to draw
+            
+        Returns:
+            numpy.ndarray: n propagation delays in seconds
+        """
+        u1, u2 = self._rng.random((2, n))
+        out = np.empty(n, dtype=np.float64)
+        _sample_delays(self._cdf, self._low, self._high, u1, u2, out)
+        return out
     
-    def check_configuration_match(self, expected_config):
+    def check_configuration_match(self, expected_key):
         """
         Override to simulate eventual consistency with realistic delays
         """
         if not self.enable_simulation:
             # Skip simulation, use real AWS behavior
-            return super().check_configuration_match(expected_config)
+            return super().check_configuration_match(expected_key)
         
-        # Generate delay on first check
-        if not hasattr(self, '_simulated_delay'):
-            self._simulated_delay = self._generate_propagation_delay()
-            self._propagation_start = time.time()
-            print(f" [Sim: {self._simulated_delay:.1f}s]", end='')
+        # Generate delay on first check (state is per worker thread)
+        sim = self._local
+        if not hasattr(sim, 'simulated_delay'):
+            planned = getattr(sim, 'planned_delay', None)
+            sim.simulated_delay = planned if planned is not None else self._generate_propagation_delay()
+            sim.propagation_start = time.monotonic()
+            if self.wake_on_propagation:
+                sim.ready_timer = threading.Timer(sim.simulated_delay, self._ready_event().set)
+                sim.ready_timer.daemon = True
+                sim.ready_timer.start()
+            if self.verbose:
+                logger.debug("  [Sim: %.1fs]", sim.simulated_delay)
         
         # Check if enough time has passed
-        elapsed = time.time() - self._propagation_start
-        if elapsed >= self._simulated_delay:
+        elapsed = time.monotonic() - sim.propagation_start
+        if elapsed >= sim.simulated_delay:
             # Propagation complete, do real check
-            return super().check_configuration_match(expected_config)
+            return super().check_configuration_match(expected_key)
         else:
             # Still propagating
             return False
@@ -82,8 +155,84 @@ class SimulatedBaseWaiterStrategy(BaseWaiterStrategy):
         """
         Reset simulation state for each test
         """
-        if hasattr(self, '_simulated_delay'):
-            delattr(self, '_simulated_delay')
-        if hasattr(self, '_propagation_start'):
-            delattr(self, '_propagation_start')
-        return super().run_single_test(test_id)
\ No newline at end of file
+        sim = self._local
+        # A timed-out test may leave its timer pending; don't let it wake the next one
+        if hasattr(sim, 'ready_timer'):
+            sim.ready_timer.cancel()
+            delattr(sim, 'ready_timer')
+        if hasattr(sim, 'simulated_delay'):
+            delattr(sim, 'simulated_delay')
+        if hasattr(sim, 'propagation_start'):
+            delattr(sim, 'propagation_start')
+        delays = self._suite_delays
+        if delays is not None and 0 <= test_id < len(delays):
+            sim.planned_delay = float(delays[test_id])
+        else:
+            sim.planned_delay = None
+        return super().run_single_test(test_id)
+    
+    def run_test_suite(self, num_tests=30, extra_buckets=(), use_events=False):
+        """
+        Pre-sample every test's simulated delay in one batch, then run
+        
+        Lifecycle events only apply to real mode: the propagation delay
+        is injected here, so a CloudTrail event says nothing about it.
+        """
+        if self.enable_simulation:
+            self._suite_delays = self._generate_propagation_delays(num_tests)
+            use_events = False
+        try:
+            return super().run_test_suite(num_tests, extra_buckets, use_events)
+        finally:
+            self._suite_delays = None
+
+
+def make_fixed_strategy(strategy_name, interval, timeout):
+    """
+    Build a simulated strategy class with a fixed polling interval and timeout
+    
+    The constants are bound as default arguments, so the per-poll methods
+    read locals instead of instance attributes.
+    
+    Args:
+        strategy_name: Human-readable name for the strategy
+        interval: Seconds between checks
+        timeout: Seconds before giving up
+        
+    Returns:
+        type: SimulatedBaseWaiterStrategy subclass
+    """
+    class FixedStrategy(SimulatedBaseWaiterStrategy):
+        polling_interval = interval
+        timeout_seconds = timeout
+        
+        def __init__(self, bucket_name, enable_simulation=True, verbose=False):
+            super().__init__(bucket_name, strategy_name, enable_simulation, verbose)
+        
+        def calculate_next_interval(self, elapsed_time, check_count, _i=interval):
+            return _i
+        
+        def should_timeout(self, elapsed_time, check_count, _t=timeout):
+            return elapsed_time >= _t
+    
+    FixedStrategy.__name__ = FixedStrategy.__qualname__ = f"FixedStrategy_{interval}s_{timeout}s"
+    return FixedStrategy
+
+
+def jittered_step(steps, elapsed_time):
+    """
+    Polling interval from a stepped schedule, jittered +/-50%
+    
+    The jitter keeps the same mean cost, but concurrent tests no longer
+    poll S3 in synchronized waves.
+    
+    Args:
+        steps: (elapsed-time limit, base interval) pairs, checked in order;
+            the last limit should be float('inf')
+        elapsed_time: Time elapsed since configuration was applied (seconds)
+        
+    Returns:
+        float: Seconds to wait before next check
+    """
+    base = next(v for limit, v in steps if elapsed_time < limit)
+    return random.uniform(base * 0.5, base * 1.5)
@@ -28,8 +28,7 @@ Expected Advantages:
 WITH SIMULATION
 """
 
-from simulated_waiter import SimulatedBaseWaiterStrategy
-import statistics
+from simulated_waiter import SimulatedBaseWaiterStrategy, jittered_step
 
 
 class AdaptiveStrategy(SimulatedBaseWaiterStrategy):
@@ -37,56 +36,70 @@ class AdaptiveStrategy(SimulatedBaseWaiterStrategy):
     Adaptive strategy with simulated delays - IMPROVED VERSION
     """
     
-    def __init__(self, bucket_name, enable_simulation=True):
-        super().__init__(bucket_name, "Adaptive-Learning-v2", enable_simulation)
+    def __init__(self, bucket_name, enable_simulation=True, verbose=False):
+        super().__init__(bucket_name, "Adaptive-Learning-v2", enable_simulation, verbose)
         self.historical_times = []
         self.min_timeout = 300  # ✅ 改进1: 从180s提升到300s (覆盖P90)
         self.max_timeout = 600  
         self.history_size = 20
+        self._timeout_cached = self.min_timeout
+    
+    # (elapsed-time limit, base interval) pairs, checked in order
+    _STEPS = (
+        (30, 2),            # 早期密集 (原来是3)
+        (60, 4),            # 中等 (原来是5)
+        (120, 8),           # 稍疏
+        (180, 10),          # 稀疏
+        (float('inf'), 15), # 非常稀疏（节省API调用）
+    )
     
     def calculate_next_interval(self, elapsed_time, check_count):
         """
         ✅ 改进2: 更智能的轮询间隔
         早期更频繁，后期更稀疏（类似Hybrid的思路）
         """
-        if elapsed_time < 30:
-            return 2  # 早期密集 (原来是3)
-        elif elapsed_time < 60:
-            return 4  # 中等 (原来是5)
-        elif elapsed_time < 120:
-            return 8  # 稍疏
-        elif elapsed_time < 180:
-            return 10  # 稀疏
-        else:
-            return 15  # 非常稀疏（节省API调用）
+        return jittered_step(self._STEPS, elapsed_time)
     
     def should_timeout(self, elapsed_time, check_count):
         """
-        ✅ 改进3: 更保守的timeout计算
+        ✅ 改进3: 更保守的timeout计算 (cached by _update_timeout)
+        """
+        return elapsed_time >= self._timeout_cached
+    
+    def _compute_timeout(self):
+        return self._timeout_cached
+    
+    def _update_timeout(self):
         """
+        Recompute the timeout after historical_times changes
+        """
+        h = self.historical_times
         # Bootstrap: 前3个测试用更长的min_timeout（原来是5个）
-        if len(self.historical_times) < 3:
-            timeout = self.min_timeout
-        else:
-            mean = statistics.mean(self.historical_times)
-            stdev = statistics.stdev(self.historical_times)
-            
-            # ✅ 改进4: 从2*stdev改成3*stdev（更保守）
-            # 2*stdev覆盖95%，3*stdev覆盖99.7%
-            timeout = mean + (3 * stdev)
-            
-            # 确保至少是min_timeout，最多是max_timeout
-            timeout = max(self.min_timeout, min(timeout, self.max_timeout))
+        if len(h) < 3:
+            self._timeout_cached = self.min_timeout
+            return
+        
+        n = len(h)
+        mean = sum(h) / n
+        stdev = (sum((x - mean) ** 2 for x in h) / (n - 1)) ** 0.5
+        
+        # ✅ 改进4: 从2*stdev改成3*stdev（更保守）
+        # 2*stdev覆盖95%，3*stdev覆盖99.7%
+        timeout = mean + (3 * stdev)
         
-        return elapsed_time >= timeout
+        # 确保至少是min_timeout，最多是max_timeout
+        self._timeout_cached = max(self.min_timeout, min(timeout, self.max_timeout))
     
     def run_single_test(self, test_id):
         result = super().run_single_test(test_id)
         
         if result['success']:
-            self.historical_times.append(result['propagation_time'])
-            if len(self.historical_times) > self.history_size:
-                self.historical_times.pop(0)
+            # Tests may finish concurrently when run on several buckets
+            with self._results_lock:
+                self.historical_times.append(result['propagation_time'])
+                if len(self.historical_times) > self.history_size:
+                    self.historical_times.pop(0)
+                self._update_timeout()
         
         return result
 
@@ -95,16 +108,19 @@ def main():
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python strategy_adaptive_v2.py <bucket-name>")
+        print("Usage: python strategy_adaptive_v2.py <bucket-name> [extra-bucket ...]")
         sys.exit(1)
     
     bucket_name = sys.argv[1]
+    extra_buckets = sys.argv[2:]
     
     print("\n" + "="*70)
     print("STRATEGY 2.3: ADAPTIVE TIMEOUT TEST v2 (IMPROVED)")
     print("="*70)
     print(f"Bucket: {bucket_name}")
-    print(f"Polling: Variable (2-15 seconds, adaptive)")
+    if extra_buckets:
+        print(f"Parallel buckets: {', '.join(extra_buckets)}")
+    print(f"Polling: Variable (2-15 seconds, adaptive, +/-50% jitter)")
     print(f"Timeout: Dynamic (300-600 seconds, learned)")
     print(f"  - Bootstrap (first 3 tests): 300s minimum")
     print(f"  - Learning phase: mean + 3×stdev")
@@ -114,7 +130,7 @@ def main():
     print("="*70 + "\n")
     
     strategy = AdaptiveStrategy(bucket_name, enable_simulation=True)
-    results = strategy.run_test_suite(num_tests=30)
+    results = strategy.run_test_suite(num_tests=30, extra_buckets=extra_buckets)
     
     print("\nTest suite completed!")
 
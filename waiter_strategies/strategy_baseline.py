@@ -12,39 +12,31 @@ to establish a baseline for comparison with improved strategies.
 WITH SIMULATION
 """
 
-from simulated_waiter import SimulatedBaseWaiterStrategy
+from simulated_waiter import make_fixed_strategy
 
 
-class BaselineStrategy(SimulatedBaseWaiterStrategy):
+class BaselineStrategy(make_fixed_strategy("Baseline-3s-180s", interval=3, timeout=180)):
     """
     Baseline strategy with simulated delays
     """
-    
-    def __init__(self, bucket_name, enable_simulation=True):
-        super().__init__(bucket_name, "Baseline-3s-180s", enable_simulation)
-        self.polling_interval = 3
-        self.timeout_seconds = 180
-    
-    def calculate_next_interval(self, elapsed_time, check_count):
-        return self.polling_interval
-    
-    def should_timeout(self, elapsed_time, check_count):
-        return elapsed_time >= self.timeout_seconds
 
 
 def main():
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python strategy_baseline.py <bucket-name>")
+        print("Usage: python strategy_baseline.py <bucket-name> [extra-bucket ...]")
         sys.exit(1)
     
     bucket_name = sys.argv[1]
+    extra_buckets = sys.argv[2:]
     
     print("\n" + "="*70)
     print("STRATEGY 2.1: BASELINE TEST (WITH SIMULATION)")
     print("="*70)
     print(f"Bucket: {bucket_name}")
+    if extra_buckets:
+        print(f"Parallel buckets: {', '.join(extra_buckets)}")
     print(f"Polling: Every 3 seconds")
     print(f"Timeout: 180 seconds")
     print(f"Simulation: GitHub Issue #25939 distribution")
@@ -52,7 +44,7 @@ def main():
     print("="*70 + "\n")
     
     strategy = BaselineStrategy(bucket_name, enable_simulation=True)
-    results = strategy.run_test_suite(num_tests=30)
+    results = strategy.run_test_suite(num_tests=30, extra_buckets=extra_buckets)
     
     print("\nTest suite completed!")
 
@@ -19,39 +19,31 @@ we need smarter polling, not just longer waiting.
 WITH SIMULATION
 """
 
-from simulated_waiter import SimulatedBaseWaiterStrategy
+from simulated_waiter import make_fixed_strategy
 
 
-class ExtendedTimeoutStrategy(SimulatedBaseWaiterStrategy):
+class ExtendedTimeoutStrategy(make_fixed_strategy("Extended-3s-600s", interval=3, timeout=600)):
     """
     Extended timeout strategy with simulated delays
     """
-    
-    def __init__(self, bucket_name, enable_simulation=True):
-        super().__init__(bucket_name, "Extended-3s-600s", enable_simulation)
-        self.polling_interval = 3
-        self.timeout_seconds = 600
-    
-    def calculate_next_interval(self, elapsed_time, check_count):
-        return self.polling_interval
-    
-    def should_timeout(self, elapsed_time, check_count):
-        return elapsed_time >= self.timeout_seconds
 
 
 def main():
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python strategy_extended.py <bucket-name>")
+        print("Usage: python strategy_extended.py <bucket-name> [extra-bucket ...]")
         sys.exit(1)
     
     bucket_name = sys.argv[1]
+    extra_buckets = sys.argv[2:]
     
     print("\n" + "="*70)
     print("STRATEGY 2.2: EXTENDED TIMEOUT TEST (WITH SIMULATION)")
     print("="*70)
     print(f"Bucket: {bucket_name}")
+    if extra_buckets:
+        print(f"Parallel buckets: {', '.join(extra_buckets)}")
     print(f"Polling: Every 3 seconds")
     print(f"Timeout: 600 seconds (10 minutes)")
     print(f"Simulation: GitHub Issue #25939 distribution")
@@ -59,7 +51,7 @@ def main():
     print("="*70 + "\n")
     
     strategy = ExtendedTimeoutStrategy(bucket_name, enable_simulation=True)
-    results = strategy.run_test_suite(num_tests=30)
+    results = strategy.run_test_suite(num_tests=30, extra_buckets=extra_buckets)
     
     print("\nTest suite completed!")
 
@@ -17,10 +17,13 @@ Rationale: Inspired by Dean & Barroso's hedging strategies:
 This strategy balances efficiency (few API calls for fast propagations) 
 with reliability (handles slow propagations gracefully).
 
+Each interval is jittered +/-50% around its step so that parallel tests
+don't hit the S3 API in lockstep (thundering herd).
+
 WITH SIMULATION
 """
 
-from simulated_waiter import SimulatedBaseWaiterStrategy
+from simulated_waiter import SimulatedBaseWaiterStrategy, jittered_step
 
 
 class HybridStrategy(SimulatedBaseWaiterStrategy):
@@ -28,19 +31,15 @@ class HybridStrategy(SimulatedBaseWaiterStrategy):
     Hybrid strategy with simulated delays
     """
     
-    def __init__(self, bucket_name, enable_simulation=True):
-        super().__init__(bucket_name, "Hybrid-Dense-Sparse", enable_simulation)
+    def __init__(self, bucket_name, enable_simulation=True, verbose=False):
+        super().__init__(bucket_name, "Hybrid-Dense-Sparse", enable_simulation, verbose)
         self.timeout_seconds = 600
     
+    # (elapsed-time limit, base interval) pairs, checked in order
+    _STEPS = ((30, 2), (60, 4), (120, 8), (float('inf'), 15))
+    
     def calculate_next_interval(self, elapsed_time, check_count):
-        if elapsed_time < 30:
-            return 2
-        elif elapsed_time < 60:
-            return 4
-        elif elapsed_time < 120:
-            return 8
-        else:
-            return 15
+        return jittered_step(self._STEPS, elapsed_time)
     
     def should_timeout(self, elapsed_time, check_count):
         return elapsed_time >= self.timeout_seconds
@@ -50,16 +49,19 @@ def main():
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python strategy_hybrid.py <bucket-name>")
+        print("Usage: python strategy_hybrid.py <bucket-name> [extra-bucket ...]")
         sys.exit(1)
     
     bucket_name = sys.argv[1]
+    extra_buckets = sys.argv[2:]
     
     print("\n" + "="*70)
     print("STRATEGY 2.4: HYBRID POLLING TEST (WITH SIMULATION)")
     print("="*70)
     print(f"Bucket: {bucket_name}")
-    print(f"Polling: Adaptive (2-15 seconds)")
+    if extra_buckets:
+        print(f"Parallel buckets: {', '.join(extra_buckets)}")
+    print(f"Polling: Adaptive (2-15 seconds, +/-50% jitter)")
     print(f"  - 0-30s: Every 2 seconds (dense)")
     print(f"  - 30-60s: Every 4 seconds (moderate)")
     print(f"  - 60-120s: Every 8 seconds (less frequent)")
@@ -70,7 +72,7 @@ def main():
     print("="*70 + "\n")
     
     strategy = HybridStrategy(bucket_name, enable_simulation=True)
-    results = strategy.run_test_suite(num_tests=30)
+    results = strategy.run_test_suite(num_tests=30, extra_buckets=extra_buckets)
     
     print("\nTest suite completed!")
 